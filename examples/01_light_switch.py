@@ -1,11 +1,18 @@
+import httpx
 import openai
 from moorellm import MooreFSM
 from moorellm.models import MooreRun
 
 LIGHT_STATE = "OFF"
 
+# Shared keep-alive connection pool, reused across every turn so each
+# request skips the TLS handshake
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+)
+
 # Create the FSM
-fsm = MooreFSM(initial_state="START")
+fsm = MooreFSM(initial_state="START", http_client=http_client)
 
 
 # Define the states
@@ -65,14 +72,17 @@ async def state_on(fsm: MooreFSM, response: str, will_transition: bool):
 
 async def main():
     """Example of a simple light switch FSM using MooreFSM"""
-    # Create the OpenAI client
-    openai_client = openai.AsyncOpenAI()
+    # Create the OpenAI client on top of the shared connection pool
+    openai_client = openai.AsyncOpenAI(http_client=http_client)
     # Simulate conversation
-    while True:
-        user_input = input("You: ")
-        run_state: MooreRun = await fsm.run(openai_client, user_input=user_input)
-        print(f"AI: {run_state.response}")
-        print("CURRENT LIGHT STATE: ", LIGHT_STATE)
+    try:
+        while True:
+            user_input = input("You: ")
+            run_state: MooreRun = await fsm.run(openai_client, user_input=user_input)
+            print(f"AI: {run_state.response}")
+            print("CURRENT LIGHT STATE: ", LIGHT_STATE)
+    finally:
+        await fsm.aclose()
 
 
 if __name__ == "__main__":
@@ -1,10 +1,19 @@
+import httpx
 import openai
 from pydantic import BaseModel
 from moorellm import MooreFSM
 from moorellm.models import MooreRun
 
+# Shared keep-alive connection pool, reused across every turn so each
+# request skips the TLS handshake
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+)
+
 # Create the FSM
-fsm = MooreFSM(initial_state="START", end_state="IDENTIFIED")
+fsm = MooreFSM(
+    initial_state="START", end_state="IDENTIFIED", http_client=http_client
+)
 
 
 class UserIdentificationResponse(BaseModel):
@@ -38,13 +47,16 @@ async def start_state(
 
 
 async def main():
-    # Create the OpenAI client
-    openai_client = openai.AsyncOpenAI()
+    # Create the OpenAI client on top of the shared connection pool
+    openai_client = openai.AsyncOpenAI(http_client=http_client)
     # Simulate conversation
-    while fsm.is_completed() is False:
-        user_input = input("You: ")
-        run_state: MooreRun = await fsm.run(openai_client, user_input=user_input)
-        print(f"AI: {run_state.response}")
+    try:
+        while fsm.is_completed() is False:
+            user_input = input("You: ")
+            run_state: MooreRun = await fsm.run(openai_client, user_input=user_input)
+            print(f"AI: {run_state.response}")
+    finally:
+        await fsm.aclose()
 
     # Get the context data
     context_data = fsm.get_context_data("verified_user")
@@ -1,2 +1,3 @@
-from moorellm.main import MooreFSM
+from moorellm.main import MooreFSM, run_many
+from moorellm.batch import run_batch
 from moorellm.models import MooreState, MooreRun, DefaultResponse, StateMachineError
@@ -0,0 +1,140 @@
+import asyncio
+import json
+from typing import Union
+import openai
+from openai.lib._parsing import type_to_response_format_param
+
+# Setup logging
+import logging
+
+logger = logging.getLogger("moorellm")
+
+from moorellm.main import MooreFSM
+from moorellm.models import MooreRun, StateMachineError
+from moorellm.utils import _dump_enclosed_response
+
+#: Batch statuses that mean the batch will make no further progress
+_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+async def run_batch(
+    async_openai_instance: Union[openai.AsyncAzureOpenAI, openai.AsyncOpenAI],
+    runs: list,
+    model: str = "gpt-4o-2024-08-06",
+    completion_window: str = "24h",
+    poll_interval: float = 30.0,
+    **kwargs,
+) -> list:
+    """Run one pending turn per FSM through the OpenAI Batch API.
+
+    For non-interactive workloads (eval runs, dataset labeling over recorded
+    transcripts) the Batch API costs half as much as the interactive endpoint
+    in exchange for a completion window of up to 24 hours. Each (fsm,
+    user_input) pair is serialized into one JSONL request line, submitted as a
+    single batch, and once the batch completes every FSM is resumed with its
+    parsed response exactly as an interactive run() would have done.
+
+    :param async_openai_instance: OpenAI/AzureOpenAI instance to use for the batch
+    :param runs: List of (fsm, user_input) pairs, one pending turn per FSM
+    :param model: Model to use for completion, default is "gpt-4o-2024-08-06"
+    :param completion_window: Batch completion window, default is "24h"
+    :param poll_interval: Seconds to sleep between batch status polls
+    :type async_openai_instance: Union[openai.AsyncAzureOpenAI, openai.AsyncOpenAI]
+    :type runs: list[tuple[MooreFSM, str]]
+    :type model: str
+    :type completion_window: str
+    :type poll_interval: float
+    :return: List of MooreRun objects, in the same order as the input pairs
+    :rtype: list[:class:`moorellm.models.MooreRun`]
+
+    .. code-block:: python
+
+        results = await run_batch(
+            async_openai_instance,
+            [(fsm, transcript_line) for fsm, transcript_line in pending],
+        )
+
+    .. note:: A state function returning ImmediateStateChange falls back to an interactive run() call for its rerun, only the initial turn goes through the batch.
+    """
+    # Prepare every turn up front, the request body mirrors what run() sends
+    prepared = []
+    request_lines = []
+    for index, (fsm, user_input) in enumerate(runs):
+        turn = fsm._prepare_turn(user_input, model)
+        prepared.append((fsm, turn))
+        _, _, _, chat_history_copy_executable, output_response_model = turn
+        request_lines.append(
+            json.dumps(
+                {
+                    "custom_id": str(index),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": model,
+                        "messages": chat_history_copy_executable,
+                        "response_format": type_to_response_format_param(
+                            output_response_model
+                        ),
+                    },
+                }
+            )
+        )
+
+    # Upload the request file and submit the batch
+    batch_file = await async_openai_instance.files.create(
+        file=("moorellm_batch.jsonl", "\n".join(request_lines).encode()),
+        purpose="batch",
+    )
+    batch = await async_openai_instance.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window=completion_window,
+    )
+    logger.debug("Submitted batch: %s with %s requests", batch.id, len(request_lines))
+
+    # Poll until the batch reaches a terminal status
+    while batch.status not in _TERMINAL_STATUSES:
+        await asyncio.sleep(poll_interval)
+        batch = await async_openai_instance.batches.retrieve(batch.id)
+        logger.debug("Batch %s status: %s", batch.id, batch.status)
+
+    if batch.status != "completed":
+        raise StateMachineError(f"Batch {batch.id} ended with status: {batch.status}")
+
+    # Map each result line back to its FSM by custom_id
+    output_content = await async_openai_instance.files.content(batch.output_file_id)
+    results_by_id = {}
+    for line in output_content.text.splitlines():
+        if not line.strip():
+            continue
+        result_line = json.loads(line)
+        results_by_id[result_line["custom_id"]] = result_line
+
+    # Resume every FSM with its parsed response, same post-parse path as run()
+    moore_runs = []
+    for index, (fsm, turn) in enumerate(prepared):
+        result_line = results_by_id.get(str(index))
+        if result_line is None or result_line.get("error"):
+            raise StateMachineError(
+                f"Batch request {index} failed: {result_line and result_line.get('error')}"
+            )
+
+        current_state, user_message, chat_history_copy, _, output_response_model = turn
+        body = result_line["response"]["body"]
+        parsed = output_response_model.model_validate_json(
+            body["choices"][0]["message"]["content"]
+        )
+        moore_runs.append(
+            await fsm._complete_turn(
+                async_openai_instance,
+                _dump_enclosed_response(parsed),
+                current_state,
+                user_message,
+                chat_history_copy,
+                model,
+                parsed_response=parsed,
+                **kwargs,
+            )
+        )
+
+    return moore_runs
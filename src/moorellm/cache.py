@@ -0,0 +1,97 @@
+import json
+import sqlite3
+import time
+from typing import Any, Optional
+
+# Setup logging
+import logging
+
+logger = logging.getLogger("moorellm")
+
+# orjson is an optional Rust-backed speedup for the JSON hot paths
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class SqliteResponseCache:
+    """SQLite-backed response cache surviving process restarts.
+
+    The in-memory caches vanish per process, so dev loops, eval sweeps and
+    serverless cold-starts re-pay the full OpenAI latency bill on every
+    restart. This cache stores parsed response dicts under the same hash key
+    as the in-memory LRU, in a single-table key/value schema with WAL
+    journaling for cheap concurrent reads.
+
+    :param path: Filesystem path of the SQLite database, created if missing
+    :param max_mb: Approximate size cap in megabytes, oldest rows are evicted beyond it
+    :type path: str
+    :type max_mb: int
+
+    .. code-block:: python
+
+        fsm = MooreFSM(initial_state="START", cache_path="responses.db")
+    """
+
+    def __init__(self, path: str, max_mb: int = 200):
+        self._path = path
+        self._max_bytes = max_mb * 1024 * 1024
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS kv (k BLOB PRIMARY KEY, v BLOB, ts INTEGER)"
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Get the cached response dict for a key, or None on a miss."""
+        row = self._connection.execute(
+            "SELECT v FROM kv WHERE k = ?", (key.encode(),)
+        ).fetchone()
+        if row is None:
+            return None
+        if orjson is not None:
+            return orjson.loads(row[0])
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict):
+        """Store a response dict under a key, evicting oldest rows when over the size cap."""
+        if orjson is not None:
+            serialized = orjson.dumps(value)
+        else:
+            serialized = json.dumps(value, default=str).encode()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO kv (k, v, ts) VALUES (?, ?, ?)",
+            (key.encode(), serialized, int(time.time())),
+        )
+        self._connection.commit()
+        self._evict_if_needed()
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        self._connection.close()
+
+    def _database_size(self) -> int:
+        """Current database size in bytes, from the SQLite page counters."""
+        (page_count,) = self._connection.execute("PRAGMA page_count").fetchone()
+        (page_size,) = self._connection.execute("PRAGMA page_size").fetchone()
+        return page_count * page_size
+
+    def _evict_if_needed(self):
+        """Drop the oldest quarter of rows while the database exceeds the cap."""
+        while self._database_size() > self._max_bytes:
+            (row_count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM kv"
+            ).fetchone()
+            if row_count == 0:
+                break
+            evict_count = max(1, row_count // 4)
+            self._connection.execute(
+                "DELETE FROM kv WHERE k IN (SELECT k FROM kv ORDER BY ts LIMIT ?)",
+                (evict_count,),
+            )
+            self._connection.commit()
+            self._connection.execute("VACUUM")
+            logger.debug("Evicted %s oldest rows from response cache", evict_count)
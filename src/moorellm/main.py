@@ -1,6 +1,12 @@
-from functools import wraps
+import asyncio
+import collections
+import hashlib
+import inspect
+import json
+import math
 from typing import Callable, Dict, Any, Literal, Optional, Type, Union
 from pydantic import BaseModel, ValidationError, create_model
+import httpx
 import openai
 import jinja2
 
@@ -9,7 +15,16 @@ import logging
 
 logger = logging.getLogger("moorellm")
 
-from moorellm.utils import _add_transitions, _create_response_model
+# Shared Jinja2 environment, so templates are compiled once per state; no
+# auto-reload checks and a roomy bytecode cache keep repeat compiles free
+_jinja_env = jinja2.Environment(autoescape=False, auto_reload=False, cache_size=400)
+
+from moorellm.utils import (
+    _add_transitions,
+    _create_response_model,
+    _dump_enclosed_response,
+    _dumps_sorted,
+)
 from moorellm.models import (
     MooreRun,
     MooreState,
@@ -25,13 +40,77 @@ class MooreFSM:
 
     :param initial_state: Initial state of the FSM
     :param end_state: End state of the FSM, default is "END" (currently not used)
+    :param enable_cache: Enable exact-match caching of parsed completions, default is False
+    :param cache_max_entries: Maximum number of entries kept in the response cache
+    :param semantic_cache: Enable embedding-based caching of near-duplicate user inputs, default is False
+    :param sim_threshold: Minimum cosine similarity for a semantic cache hit
+    :param embed_model: Embedding model used for the semantic cache
+    :param conversation_history_threshold: Skip the semantic cache once the chat history grows beyond this many messages
+    :param split_context_prompt: Keep the system prompt byte-stable and send user defined context as a second system message, default is False
+    :param max_history_messages: Only send the most recent N history messages per turn, None disables the sliding window
+    :param summarize_after: Summarize the oldest half of the history once it grows beyond this many messages, None disables summarization
+    :param summary_model: Cheap model used for history summarization
+    :param cache_path: Path of a SQLite database for cross-process response caching, None disables it
+    :param speculative: Prefetch the next state's likely turn in the background after each run, requires enable_cache, default is False
+    :param http_client: Shared httpx.AsyncClient with a keep-alive connection pool, pass the same client to openai.AsyncOpenAI(http_client=...) and close it via aclose()
     :type initial_state: str
     :type end_state: str
+    :type enable_cache: bool
+    :type cache_max_entries: int
+    :type semantic_cache: bool
+    :type sim_threshold: float
+    :type embed_model: str
+    :type conversation_history_threshold: int
+    :type split_context_prompt: bool
+    :type max_history_messages: int, optional
+    :type summarize_after: int, optional
+    :type summary_model: str
+    :type cache_path: str, optional
+    :type speculative: bool
+    :type http_client: httpx.AsyncClient, optional
     :return: MooreFSM object
     :rtype: :class:`moorellm.main.MooreFSM`
+
+    .. note:: Every turn is one HTTPS round-trip, so constructing a fresh
+        OpenAI client per request re-pays the TLS handshake each time. Build
+        one pooled client and reuse it::
+
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+            )
+            openai_client = openai.AsyncOpenAI(http_client=http_client)
+            fsm = MooreFSM(initial_state="START", http_client=http_client)
+            ...
+            await fsm.aclose()
+
+    .. note:: OpenAI's implicit prompt caching only triggers on an exact prefix
+        match, so re-rendering volatile context into the system prompt forfeits
+        the cached-input discount every time the context changes. With
+        ``split_context_prompt=True`` the primary system prompt is sent as-is
+        (Jinja2 rendering is skipped, though a ``pre_process_system_prompt``
+        hook still applies) and ``user_defined_context`` is delivered
+        in a follow-up system message instead, keep volatile fields in the
+        context rather than inside ``{{ }}`` in the prompt.
     """
 
-    def __init__(self, initial_state: str, end_state: str = "END"):
+    def __init__(
+        self,
+        initial_state: str,
+        end_state: str = "END",
+        enable_cache: bool = False,
+        cache_max_entries: int = 128,
+        semantic_cache: bool = False,
+        sim_threshold: float = 0.92,
+        embed_model: str = "text-embedding-3-small",
+        conversation_history_threshold: int = 10,
+        split_context_prompt: bool = False,
+        max_history_messages: Optional[int] = 20,
+        summarize_after: Optional[int] = 40,
+        summary_model: str = "gpt-4o-mini",
+        cache_path: Optional[str] = None,
+        speculative: bool = False,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         """Initialize the Moore FSM with initial state and end state"""
         self._state = initial_state
         self._next_state = None
@@ -42,13 +121,34 @@ class MooreFSM:
         self._full_chat_history = []
         self._running_chat_history = []
         self.user_defined_context = {}
+        self._enable_cache = enable_cache
+        self._cache_max_entries = cache_max_entries
+        self._response_cache = collections.OrderedDict()
+        self._semantic_cache = semantic_cache
+        self._sim_threshold = sim_threshold
+        self._embed_model = embed_model
+        self._conversation_history_threshold = conversation_history_threshold
+        self._semantic_cache_entries = {}
+        self._split_context_prompt = split_context_prompt
+        self._max_history_messages = max_history_messages
+        self._summarize_after = summarize_after
+        self._summary_model = summary_model
+        self._speculative = speculative
+        self._last_input_by_state = {}
+        self._speculative_tasks = set()
+        self._http_client = http_client
+        self._disk_cache = None
+        if cache_path is not None:
+            from moorellm.cache import SqliteResponseCache
+
+            self._disk_cache = SqliteResponseCache(cache_path)
 
     def state(
         self,
         state_key: str,
         system_prompt: str,
         temperature: float = 0.5,
-        transitions: Dict[str, str] = {},
+        transitions: Optional[Dict[str, str]] = None,
         response_model: Optional[BaseModel] = None,
         pre_process_input: Optional[Callable] = None,
         pre_process_chat: Optional[Callable] = None,
@@ -67,7 +167,7 @@ class MooreFSM:
         :type state_key: str
         :type system_prompt: str
         :type temperature: float
-        :type transitions: Dict[str, str]
+        :type transitions: Dict[str, str], optional
         :type response_model: BaseModel, optional
         :type pre_process_input: Callable, optional
         :type pre_process_chat: Callable, optional
@@ -87,25 +187,32 @@ class MooreFSM:
             async def start_state(fsm: MooreFSM, response: DefaultResponse, will_transition: bool):
                 pass
 
-        .. note:: The state function should be an async function and should have the following signature:
+        .. note:: The state function may be async or plain, and should have the following signature:
 
             .. code-block:: python
 
                     async def state_function(fsm: MooreFSM, response: Any, will_transition: bool):
                         pass
 
+            A plain ``def`` handler is called directly without going through the
+            event loop, so prefer it when the handler does no awaiting of its own.
+
         .. note:: The response model should be a Pydantic model, if not defined then the response will be a string.
         """
+        # Copy into a fresh dict per state, a shared mutable default would
+        # alias the same transitions object across every registered state
+        transitions = dict(transitions or {})
 
         def decorator(func: Callable):
-            @wraps(func)
-            async def wrapper(*args, **kwargs):
-                return await func(*args, **kwargs)
+            # A prompt without Jinja2 substitutions never needs rendering
+            prompt_is_static = (
+                "{{" not in system_prompt and "{%" not in system_prompt
+            )
 
             # Register the state function
-            self._states[state_key] = MooreState(
+            moore_state = MooreState(
                 key=state_key,
-                func=wrapper,
+                func=func,
                 system_prompt=system_prompt,
                 temperature=temperature,
                 transitions=transitions,
@@ -113,8 +220,20 @@ class MooreFSM:
                 pre_process_input=pre_process_input,
                 pre_process_chat=pre_process_chat,
                 pre_process_system_prompt=pre_process_system_prompt,
+                func_is_async=inspect.iscoroutinefunction(func),
+                compiled_template=_jinja_env.from_string(system_prompt),
+                system_prompt_is_static=prompt_is_static,
             )
-            return wrapper
+
+            # Precompute the full system prompt when no per-turn work is needed,
+            # ie no Jinja2 substitutions and no pre-processing hook
+            if prompt_is_static and not pre_process_system_prompt:
+                moore_state.static_system_prompt = _add_transitions(
+                    system_prompt, moore_state
+                )
+
+            self._states[state_key] = moore_state
+            return func
 
         return decorator
 
@@ -150,22 +269,310 @@ class MooreFSM:
 
         .. note:: Only use AsyncOpenAI or AsyncAzureOpenAI instance for async completion.
         """
-        logger.debug(f"Current state: {self._state}, User input: {user_input}")
+        (
+            current_state,
+            user_message,
+            chat_history_copy,
+            chat_history_copy_executable,
+            output_response_model,
+        ) = self._prepare_turn(user_input, model)
+
+        # Remember the last input seen per state, used for speculative prefetch
+        self._last_input_by_state[current_state.key] = user_message["content"]
+
+        # Check the exact-match caches before paying for a full API round-trip
+        cache_key = None
+        response_dict = None
+        if self._enable_cache or self._disk_cache is not None:
+            cache_key = self._response_cache_key(
+                model, current_state, chat_history_copy_executable, output_response_model
+            )
+            if self._enable_cache:
+                response_dict = self._response_cache.get(cache_key)
+                if response_dict is not None:
+                    self._response_cache.move_to_end(cache_key)
+                    logger.debug("Response cache hit for state: %s", current_state.key)
+            if response_dict is None and self._disk_cache is not None:
+                response_dict = self._disk_cache.get(cache_key)
+                if response_dict is not None:
+                    logger.debug(
+                        "Disk cache hit for state: %s", current_state.key
+                    )
+
+        # Fall back to the semantic cache for near-duplicate user inputs
+        semantic_embedding = None
+        if (
+            response_dict is None
+            and self._semantic_cache
+            and len(chat_history_copy) <= self._conversation_history_threshold
+        ):
+            semantic_embedding = await self._embed_input(
+                async_openai_instance, user_input
+            )
+            response_dict = self._semantic_cache_lookup(
+                current_state, semantic_embedding
+            )
+            if response_dict is not None:
+                logger.debug("Semantic cache hit for state: %s", current_state.key)
+
+        parsed_response = None
+        if response_dict is None:
+            completion = await async_openai_instance.beta.chat.completions.parse(
+                model=model,
+                messages=chat_history_copy_executable,
+                response_format=output_response_model,
+            )
 
-        # Get the current state
+            message = completion.choices[0].message
+            if not message.parsed:
+                raise StateMachineError(
+                    f"Error in parsing the completion: {message.refusal}"
+                )
+
+            # Extract the response and next state key
+            parsed_response = message.parsed
+            response_dict = _dump_enclosed_response(parsed_response)
+
+            if cache_key is not None and self._enable_cache:
+                self._response_cache[cache_key] = response_dict
+                self._response_cache.move_to_end(cache_key)
+                while len(self._response_cache) > self._cache_max_entries:
+                    self._response_cache.popitem(last=False)
+
+            if cache_key is not None and self._disk_cache is not None:
+                self._disk_cache.put(cache_key, response_dict)
+
+            if semantic_embedding is not None:
+                self._semantic_cache_entries.setdefault(current_state.key, []).append(
+                    (semantic_embedding, response_dict)
+                )
+
+        moore_run = await self._complete_turn(
+            async_openai_instance,
+            response_dict,
+            current_state,
+            user_message,
+            chat_history_copy,
+            model,
+            *args,
+            parsed_response=parsed_response,
+            **kwargs,
+        )
+
+        # Periodically compact the oldest half of the history into a summary
+        if (
+            self._summarize_after is not None
+            and len(self._chat_history) > self._summarize_after
+        ):
+            await self._summarize_history(async_openai_instance)
+
+        # Speculatively warm the cache for the next turn while the user types
+        if self._speculative and self._enable_cache:
+            prefetch_task = asyncio.create_task(
+                self._speculative_prefetch(async_openai_instance, model)
+            )
+            self._speculative_tasks.add(prefetch_task)
+            prefetch_task.add_done_callback(self._speculative_tasks.discard)
+
+        return moore_run
+
+    def run_sync(
+        self,
+        async_openai_instance: Union[openai.AsyncAzureOpenAI, openai.AsyncOpenAI],
+        user_input: str,
+        model: str = "gpt-4o-2024-08-06",
+        *args,
+        **kwargs,
+    ) -> MooreRun:
+        """Synchronous convenience wrapper around :meth:`run` for callers without an event loop.
+
+        :param async_openai_instance: OpenAI/AzureOpenAI instance to use for completion
+        :param user_input: User input to the FSM
+        :param model: Model to use for completion, default is "gpt-4o-2024-08-06"
+        :type async_openai_instance: Union[openai.AsyncAzureOpenAI, openai.AsyncOpenAI]
+        :type user_input: str
+        :type model: str
+        :return: MooreRun object
+        :rtype: :class:`moorellm.models.MooreRun`
+
+        .. note:: This must not be called from inside a running event loop, use :meth:`run` there instead.
+        """
+        return asyncio.run(
+            self.run(async_openai_instance, user_input, model, *args, **kwargs)
+        )
+
+    async def run_parallel_state(
+        self,
+        async_openai_instance: Union[openai.AsyncAzureOpenAI, openai.AsyncOpenAI],
+        user_inputs: list,
+        model: str = "gpt-4o-2024-08-06",
+    ) -> list:
+        """Classify several independent user inputs against the current state in one request.
+
+        Rate limits are often request-bound before token-bound, so packing N
+        inputs that share the current state's system prompt into a single
+        completion amortizes the per-request overhead. The model is instructed
+        to answer every input in order and the structured output is a JSON
+        array with one enclosed response per input.
+
+        :param async_openai_instance: OpenAI/AzureOpenAI instance to use for completion
+        :param user_inputs: Independent user inputs to classify against the current state
+        :param model: Model to use for completion, default is "gpt-4o-2024-08-06"
+        :type async_openai_instance: Union[openai.AsyncAzureOpenAI, openai.AsyncOpenAI]
+        :type user_inputs: list[str]
+        :type model: str
+        :return: List of parsed response dicts (with response and next_state_key), one per input
+        :rtype: list[dict]
+
+        .. note:: This is a read-only probe, it does not advance the FSM state or touch the chat history.
+        """
         current_state: MooreState = self._states.get(self._state, None)
         if not current_state:
             logger.error(StateMachineError(f"State {self._state} not found in states."))
 
-        if current_state.pre_process_input:
-            user_input = current_state.pre_process_input(user_input, self) or user_input
-            logger.debug(f"Pre-processed user input: {user_input}")
+        processed_system_prompt = self._process_system_prompt(current_state)
+
+        output_response_model = _create_response_model(
+            current_state.response_model, current_state.transitions, current_state.key
+        )
+        batch_response_model = create_model(
+            "EnclosedResponseList",
+            responses=(list[output_response_model], ...),
+        )
+
+        listed_inputs = "\n".join(
+            f"{index + 1}. {user_input}" for index, user_input in enumerate(user_inputs)
+        )
+        user_message = {
+            "role": "user",
+            "content": (
+                "Respond to each of the following independent user inputs, "
+                "returning exactly one response per input, in order:\n"
+                + listed_inputs
+            ),
+        }
 
-        state_system_prompt = current_state.system_prompt
+        completion = await async_openai_instance.beta.chat.completions.parse(
+            model=model,
+            messages=[
+                {"role": "system", "content": processed_system_prompt},
+                user_message,
+            ],
+            response_format=batch_response_model,
+        )
+
+        message = completion.choices[0].message
+        if not message.parsed:
+            raise StateMachineError(
+                f"Error in parsing the completion: {message.refusal}"
+            )
 
-        # Pre-process system prompt with Jinja2
-        template = jinja2.Template(state_system_prompt)
-        state_system_prompt = template.render(self.user_defined_context)
+        return [
+            _dump_enclosed_response(enclosed)
+            for enclosed in message.parsed.responses
+        ]
+
+    async def _speculative_prefetch(
+        self,
+        async_openai_instance: Union[openai.AsyncAzureOpenAI, openai.AsyncOpenAI],
+        model: str,
+    ):
+        """Issue the current state's likely next request and cache the result.
+
+        The guess is the last input seen for the state the FSM just landed in;
+        if the user repeats it, the next run() is answered from the cache and
+        the API latency is hidden behind human typing time. A wrong guess only
+        costs an unused cache entry.
+        """
+        try:
+            likely_user_input = self._last_input_by_state.get(self._state)
+            if likely_user_input is None:
+                return
+
+            (
+                current_state,
+                _,
+                _,
+                chat_history_copy_executable,
+                output_response_model,
+            ) = self._prepare_turn(likely_user_input, model)
+
+            cache_key = self._response_cache_key(
+                model, current_state, chat_history_copy_executable, output_response_model
+            )
+            if cache_key in self._response_cache:
+                return
+
+            completion = await async_openai_instance.beta.chat.completions.parse(
+                model=model,
+                messages=chat_history_copy_executable,
+                response_format=output_response_model,
+            )
+            message = completion.choices[0].message
+            if not message.parsed:
+                return
+
+            self._response_cache[cache_key] = _dump_enclosed_response(
+                message.parsed
+            )
+            self._response_cache.move_to_end(cache_key)
+            while len(self._response_cache) > self._cache_max_entries:
+                self._response_cache.popitem(last=False)
+            logger.debug("Speculative prefetch cached for state: %s", self._state)
+        except Exception:
+            # A failed guess must never surface to the caller
+            logger.debug("Speculative prefetch failed", exc_info=True)
+
+    async def _summarize_history(
+        self,
+        async_openai_instance: Union[openai.AsyncAzureOpenAI, openai.AsyncOpenAI],
+    ):
+        """Replace the oldest half of the chat history with a cheap summary.
+
+        Keeps the per-turn prompt payload bounded on long conversations, the
+        full chat history stays untouched for audit.
+        """
+        split_index = len(self._chat_history) // 2
+        oldest_messages = self._chat_history[:split_index]
+        remaining_messages = self._chat_history[split_index:]
+
+        transcript = "\n".join(
+            f"{message['role']}: {message['content']}" for message in oldest_messages
+        )
+        completion = await async_openai_instance.chat.completions.create(
+            model=self._summary_model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "Summarize this conversation concisely, keeping every fact needed to continue it.",
+                },
+                {"role": "user", "content": transcript},
+            ],
+        )
+        summary = completion.choices[0].message.content
+
+        self._chat_history = [
+            {"role": "system", "content": f"Conversation so far: {summary}"},
+            *remaining_messages,
+        ]
+        logger.debug(
+            "Summarized %s oldest messages into one summary message",
+            len(oldest_messages),
+        )
+
+    def _process_system_prompt(self, current_state: MooreState) -> str:
+        """Produce the fully processed system prompt for the given state."""
+        if current_state.static_system_prompt is not None:
+            # Fully static prompt, precomputed at registration time
+            return current_state.static_system_prompt
+
+        # Render the pre-compiled Jinja2 template of the system prompt, or skip
+        # the render entirely when the prompt has no substitutions
+        state_system_prompt = (
+            current_state.system_prompt
+            if current_state.system_prompt_is_static
+            else current_state.compiled_template.render(self.user_defined_context)
+        )
 
         if current_state.pre_process_system_prompt:
             state_system_prompt = (
@@ -173,20 +580,85 @@ class MooreFSM:
                 or state_system_prompt
             )
 
-        processed_system_prompt = _add_transitions(state_system_prompt, current_state)
-        logger.debug(f"Processed system prompt: {processed_system_prompt}")
+        return _add_transitions(state_system_prompt, current_state)
+
+    def _prepare_turn(self, user_input: str, model: str) -> tuple:
+        """Assemble everything needed to issue this turn's completion request.
 
-        # Make copy of chat history (this is to prevent duplication of messages when in pattern of call then cancel)
-        chat_history_copy = self._chat_history.copy()
-        full_chat_history_copy = self._full_chat_history.copy()
+        Returns the current state, the user message, the working chat history,
+        the executable message list (with system prompt) and the enclosed
+        response model. Does not mutate the stored chat history.
+        """
+        logger.debug("Current state: %s, User input: %s", self._state, user_input)
+
+        # Get the current state
+        current_state: MooreState = self._states.get(self._state, None)
+        if not current_state:
+            logger.error(StateMachineError(f"State {self._state} not found in states."))
 
-        # Add user input to chat history
-        chat_history_copy.append({"role": "user", "content": user_input})
-        full_chat_history_copy.append({"role": "user", "content": user_input})
+        if current_state.pre_process_input:
+            user_input = current_state.pre_process_input(user_input, self) or user_input
+            logger.debug("Pre-processed user input: %s", user_input)
+
+        context_message = None
+        if self._split_context_prompt:
+            # Keep the primary system prompt byte-stable so OpenAI's implicit
+            # prompt caching matches the prefix, context rides in a second
+            # system message instead of being rendered into the template. Only
+            # the Jinja2 render is skipped, a pre_process_system_prompt hook
+            # still runs (states with a hook never precompute a static prompt)
+            if current_state.static_system_prompt is not None:
+                processed_system_prompt = current_state.static_system_prompt
+            else:
+                state_system_prompt = current_state.system_prompt
+                if current_state.pre_process_system_prompt:
+                    state_system_prompt = (
+                        current_state.pre_process_system_prompt(
+                            state_system_prompt, self
+                        )
+                        or state_system_prompt
+                    )
+                processed_system_prompt = _add_transitions(
+                    state_system_prompt, current_state
+                )
+            if self.user_defined_context:
+                context_message = {
+                    "role": "system",
+                    "content": "Context: "
+                    + json.dumps(
+                        self.user_defined_context, sort_keys=True, default=str
+                    ),
+                }
+        else:
+            processed_system_prompt = self._process_system_prompt(current_state)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processed system prompt: %s", processed_system_prompt)
+
+        # Build this turn's working history without touching the stored one, it
+        # is committed only at the end (this is to prevent duplication of
+        # messages when in pattern of call then cancel)
+        user_message = {"role": "user", "content": user_input}
+        chat_history_copy = [*self._chat_history, user_message]
+
+        # Apply the sliding window, only the most recent messages are sent so
+        # per-turn token cost stays bounded (the stored history is untouched)
+        history_for_prompt = chat_history_copy
+        if (
+            self._max_history_messages is not None
+            and len(chat_history_copy) > self._max_history_messages
+        ):
+            history_for_prompt = chat_history_copy[-self._max_history_messages :]
 
         # First create a good chat history
         system_prompt_lined = {"role": "system", "content": processed_system_prompt}
-        chat_history_copy_executable = [system_prompt_lined] + chat_history_copy
+        if context_message is not None:
+            chat_history_copy_executable = [
+                system_prompt_lined,
+                context_message,
+                *history_for_prompt,
+            ]
+        else:
+            chat_history_copy_executable = [system_prompt_lined, *history_for_prompt]
 
         # Pre-process chat if needed
         if current_state.pre_process_chat:
@@ -195,42 +667,65 @@ class MooreFSM:
             )
 
         # Now let's try to call openai function
-        logger.debug(f"Getting completion for model: {model}")
+        logger.debug("Getting completion for model: %s", model)
 
         output_response_model = _create_response_model(
             current_state.response_model, current_state.transitions, current_state.key
         )
 
-        completion = await async_openai_instance.beta.chat.completions.parse(
-            model=model,
-            messages=chat_history_copy_executable,
-            response_format=output_response_model,
+        return (
+            current_state,
+            user_message,
+            chat_history_copy,
+            chat_history_copy_executable,
+            output_response_model,
         )
 
-        message = completion.choices[0].message
-        if not message.parsed:
-            raise StateMachineError(
-                f"Error in parsing the completion: {message.refusal}"
-            )
+    async def _complete_turn(
+        self,
+        async_openai_instance: Union[openai.AsyncAzureOpenAI, openai.AsyncOpenAI],
+        response_dict: dict,
+        current_state: MooreState,
+        user_message: dict,
+        chat_history_copy: list,
+        model: str,
+        *args,
+        parsed_response: Optional[BaseModel] = None,
+        **kwargs,
+    ) -> MooreRun:
+        """Apply a parsed response dict to the FSM, committing this turn.
 
-        # Extract the response and next state key
-        response_dict = message.parsed.model_dump()
+        Runs everything after the completion call: transition validation, the
+        state function, history commit and state update. When the SDK-parsed
+        enclosed model is available its already-validated attributes are used
+        directly, re-validating it from the dumped dict would triple the
+        pydantic work per turn.
+        """
+        if parsed_response is not None:
+            # Fast path, the SDK's .parse already validated everything
+            next_state_key = parsed_response.next_state_key
+            response = parsed_response.response
+            if not current_state.response_model:
+                response = response.content
+        else:
+            # Cache/batch path, rebuild the response from the plain dict
+            next_state_key = response_dict.get("next_state_key", current_state.key)
 
-        # Default to current state if no next state key
-        next_state_key = response_dict.get("next_state_key", current_state.key)
+            # Also get the response
+            response = response_dict.get("response", None)
 
-        # Also get the response
-        response = response_dict.get("response", None)
+            # If no model was specificed then get content from response
+            if not current_state.response_model:
+                response = response.get("content", response)
+            else:
+                # Parse the response model into pydantic model
+                try:
+                    response = current_state.response_model(**response)
+                except ValidationError as e:
+                    raise StateMachineError(f"Error in parsing response model: {e}")
 
-        # If no model was specificed then get content from response
-        if not current_state.response_model:
-            response = response.get("content", response)
-        else:
-            # Parse the response model into pydantic model
-            try:
-                response = current_state.response_model(**response)
-            except ValidationError as e:
-                raise StateMachineError(f"Error in parsing response model: {e}")
+        # Normalize the enum member from structured output to its string value
+        next_state_key = getattr(next_state_key, "value", next_state_key)
 
         # Check if next state key is valid
         if next_state_key not in self._states:
@@ -256,13 +751,17 @@ class MooreFSM:
             **kwargs,
         }
 
-        # Call the function
-        final_response = await current_state.func(**function_context)
+        # Call the function; a plain (non-async) handler is invoked directly,
+        # skipping the coroutine construction and event-loop round trip
+        if current_state.func_is_async:
+            final_response = await current_state.func(**function_context)
+        else:
+            final_response = current_state.func(**function_context)
         if isinstance(final_response, ImmediateStateChange):
             self._state = final_response.next_state
             new_user_input = final_response.input
             logger.debug(
-                f"Urgent shifting to: {self._next_state} and recreating response.."
+                "Urgent shifting to: %s and recreating response..", self._next_state
             )
             return await self.run(
                 async_openai_instance, new_user_input, model, *args, **kwargs
@@ -281,30 +780,33 @@ class MooreFSM:
                     "Response model is defined but no response returned from the state function."
                 )
 
-        logger.debug(f"Final response: {final_response_str}")
+        logger.debug("Final response: %s", final_response_str)
 
         # Add the response to chat history
-        chat_history_copy.append({"role": "assistant", "content": final_response_str})
-        full_chat_history_copy.append(
-            {"role": "assistant", "content": final_response_str}
-        )
+        assistant_message = {"role": "assistant", "content": final_response_str}
+        chat_history_copy.append(assistant_message)
 
         if self._running_chat_history != cached_chat_history:
-            logger.debug(f"Manually set chat history: {self._running_chat_history}")
+            logger.debug("Manually set chat history: %s", self._running_chat_history)
             self._chat_history = self._running_chat_history
         else:
             self._chat_history = chat_history_copy
 
-        self._full_chat_history = full_chat_history_copy
+        # Snapshot the full history only now that the turn has committed
+        self._full_chat_history = [
+            *self._full_chat_history,
+            user_message,
+            assistant_message,
+        ]
 
         # Update the state
         previous_state = self._state
         self._state = self._next_state
 
         if self._next_state != cached_next_state:
-            logger.debug(f"Manually transitioned to next state: {self._state}")
+            logger.debug("Manually transitioned to next state: %s", self._state)
         elif self._state != previous_state:
-            logger.debug(f"Transitioned to next state: {self._state}")
+            logger.debug("Transitioned to next state: %s", self._state)
             self._full_chat_history.append(
                 {
                     "role": "moorellm",
@@ -314,20 +816,80 @@ class MooreFSM:
 
         self._next_state = None
 
-        # Return the run object
+        # Return the run object, snapshotting the context so later mutations
+        # do not bleed into this run
         return MooreRun(
             state=self._state,
             chat_history=chat_history_copy,
-            context_data=self.user_defined_context,
+            context_data=dict(self.user_defined_context),
             response_raw=response_dict,
             response=final_response_str,
         )
 
+    def _response_cache_key(
+        self,
+        model: str,
+        current_state: MooreState,
+        messages: list,
+        output_response_model: Type[BaseModel],
+    ) -> str:
+        """Build a stable hash key for the exact-match response cache."""
+        key_payload = _dumps_sorted(
+            {
+                "model": model,
+                "state": current_state.key,
+                "messages": messages,
+                "schema": output_response_model.model_json_schema(),
+            }
+        )
+        return hashlib.blake2b(key_payload).hexdigest()
+
+    async def _embed_input(
+        self,
+        async_openai_instance: Union[openai.AsyncAzureOpenAI, openai.AsyncOpenAI],
+        user_input: str,
+    ) -> list:
+        """Embed the user input and L2-normalize it for cosine similarity lookups."""
+        result = await async_openai_instance.embeddings.create(
+            model=self._embed_model, input=user_input
+        )
+        embedding = result.data[0].embedding
+        norm = math.sqrt(sum(value * value for value in embedding)) or 1.0
+        return [value / norm for value in embedding]
+
+    def _semantic_cache_lookup(
+        self, current_state: MooreState, embedding: list
+    ) -> Optional[dict]:
+        """Find the closest cached response for this state, if similar enough.
+
+        Only entries whose next_state_key is a legal transition from the current
+        state are eligible, preventing unsafe cross-state reuse.
+        """
+        best_similarity = 0.0
+        best_response = None
+        for cached_embedding, cached_response in self._semantic_cache_entries.get(
+            current_state.key, []
+        ):
+            similarity = sum(a * b for a, b in zip(embedding, cached_embedding))
+            if similarity >= self._sim_threshold and similarity > best_similarity:
+                next_state_key = cached_response.get(
+                    "next_state_key", current_state.key
+                )
+                if (
+                    next_state_key == current_state.key
+                    or next_state_key in current_state.transitions
+                ):
+                    best_similarity = similarity
+                    best_response = cached_response
+        return best_response
+
     def reset(self):
         """Reset the FSM to initial state."""
         self._state = self._initial_state
         self._next_state = None
         self._chat_history = []
+        self._full_chat_history = []
+        self._running_chat_history = []
         self.user_defined_context = {}
         logger.debug("FSM reset to initial state.")
 
@@ -342,7 +904,19 @@ class MooreFSM:
     def set_next_state(self, next_state: str):
         """Set the next state."""
         self._next_state = next_state
-        logger.debug(f"Manually set next state: {self._next_state}")
+        logger.debug("Manually set next state: %s", self._next_state)
+
+    def force_state(self, state: str):
+        """Force the FSM into a state, discarding any pending transition.
+
+        :param state: State key to jump to
+        :type state: str
+
+        .. note:: This is an escape hatch for tests and manual recovery, prefer letting transitions drive the state.
+        """
+        self._state = state
+        self._next_state = None
+        logger.debug("Forced state to: %s", self._state)
 
     def get_chat_history(self):
         """Get the chat history, not recommended to use, please use get_running_chat_history."""
@@ -351,7 +925,7 @@ class MooreFSM:
     def set_chat_history(self, chat_history: list):
         """Set the chat history, not recommended to use, please use set_running_chat_history."""
         self._chat_history = chat_history
-        logger.debug(f"Chat history set: {chat_history}")
+        logger.debug("Chat history set: %s", chat_history)
 
     def get_running_chat_history(self):
         """Get the running chat history."""
@@ -360,7 +934,7 @@ class MooreFSM:
     def set_running_chat_history(self, chat_history: list):
         """Set the running chat history."""
         self._running_chat_history = chat_history
-        logger.debug(f"Running chat history set: {chat_history}")
+        logger.debug("Running chat history set: %s", chat_history)
 
     def get_full_chat_history(self):
         """Get the full chat history."""
@@ -369,12 +943,12 @@ class MooreFSM:
     def set_context_data(self, key: str, value: Any):
         """Set data into user defined context."""
         self.user_defined_context[key] = value
-        logger.debug(f"User defined context set: {key}={value}")
+        logger.debug("User defined context set: %s=%s", key, value)
 
     def set_context_data_dict(self, data: Dict[str, Any]):
         """Set data into user defined context."""
         self.user_defined_context.update(data)
-        logger.debug(f"User defined context set: {data}")
+        logger.debug("User defined context set: %s", data)
 
     def get_context_data(self, key: str, default: Any = None):
         """Get data from user defined context."""
@@ -387,3 +961,56 @@ class MooreFSM:
     def is_completed(self):
         """Check if the FSM is completed."""
         return self._state == self._end_state
+
+    async def aclose(self):
+        """Close the shared HTTP connection pool and the disk cache, if any."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+        logger.debug("FSM resources closed.")
+
+
+async def run_many(
+    async_openai_instance: Union[openai.AsyncAzureOpenAI, openai.AsyncOpenAI],
+    runs: list,
+    model: str = "gpt-4o-2024-08-06",
+    max_concurrency: int = 10,
+    **kwargs,
+) -> list:
+    """Run multiple independent FSM conversations concurrently.
+
+    The OpenAI API allows high request concurrency, so fanning out N
+    conversations with asyncio brings total wall time from N round-trips down
+    to roughly one. A semaphore bounds in-flight requests to stay within rate
+    limits.
+
+    :param async_openai_instance: OpenAI/AzureOpenAI instance to use for completion
+    :param runs: List of (fsm, user_input) pairs, one per conversation
+    :param model: Model to use for completion, default is "gpt-4o-2024-08-06"
+    :param max_concurrency: Maximum number of requests in flight at once
+    :type async_openai_instance: Union[openai.AsyncAzureOpenAI, openai.AsyncOpenAI]
+    :type runs: list[tuple[MooreFSM, str]]
+    :type model: str
+    :type max_concurrency: int
+    :return: List of MooreRun objects, in the same order as the input pairs
+    :rtype: list[:class:`moorellm.models.MooreRun`]
+
+    .. code-block:: python
+
+        results = await run_many(
+            async_openai_instance,
+            [(fsm_one, "Hello"), (fsm_two, "Turn on the light")],
+        )
+
+    .. note:: Each pair must use its own MooreFSM instance, concurrent runs on a single FSM would corrupt its chat history.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run_one(fsm: MooreFSM, user_input: str) -> MooreRun:
+        async with semaphore:
+            return await fsm.run(async_openai_instance, user_input, model, **kwargs)
+
+    return list(
+        await asyncio.gather(*(_run_one(fsm, user_input) for fsm, user_input in runs))
+    )
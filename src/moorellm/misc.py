@@ -1,3 +1,4 @@
+import asyncio
 from typing import Union
 import openai
 import jinja2
@@ -63,16 +64,16 @@ async def guardrail_transition(
 
                         The condition for this transition is: {condition}"""
 
-    chat_history_copy = chat_history.copy()
-    # Iterate through the chat history and remove the system prompts
-    for chat in chat_history_copy:
-        if chat["role"] == "system":
-            chat_history.remove(chat)
+    # Filter out the system prompts in one pass, without mutating the
+    # caller's chat history
+    filtered_chat_history = [
+        chat for chat in chat_history if chat["role"] != "system"
+    ]
     # Add the system prompt
-    chat_history.append({"role": "system", "content": system_prompt})
+    filtered_chat_history.append({"role": "system", "content": system_prompt})
 
     response: GuardrailResponse = await structured_call(
-        chat_history, openai_instance, GuardrailResponse
+        filtered_chat_history, openai_instance, GuardrailResponse
     )
     return response
 
@@ -99,9 +100,6 @@ async def llm_judge_response(
     """
     if max_voting_runs % 2 == 0 or max_voting_runs <= 0:
         raise ValueError("max_voting_runs must be odd and greater than 0")
-    # Using voting for n times and make LLM judge if our response is good or bad as compared to the original response
-    good_votes = 0
-    bad_votes = 0
 
     logger = logging.getLogger("moorellm")
 
@@ -116,22 +114,30 @@ async def llm_judge_response(
         f"""Response: {response}, Good or Bad Description: {good_or_bad_desc}"""
     )
 
-    for i in range(max_voting_runs):
-        response: JudgeResponse = await structured_call(
-            [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_content},
-            ],
-            openai_instance,
-            JudgeResponse,
+    # All votes are independent, scatter/gather gets n votes at 1x latency
+    responses = await asyncio.gather(
+        *(
+            structured_call(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content},
+                ],
+                openai_instance,
+                JudgeResponse,
+            )
+            for _ in range(max_voting_runs)
         )
+    )
 
+    good_votes = 0
+    for i, response in enumerate(responses):
         logger.debug(
-            f"{i} - Response: {response.is_response_good}, Thinking Steps: {response.thinking_steps}"
+            "%s - Response: %s, Thinking Steps: %s",
+            i,
+            response.is_response_good,
+            response.thinking_steps,
         )
         if response.is_response_good:
             good_votes += 1
-        else:
-            bad_votes += 1
 
-    return good_votes > bad_votes
+    return good_votes > max_voting_runs - good_votes
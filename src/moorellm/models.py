@@ -1,9 +1,10 @@
+import dataclasses
 from typing import Any, Callable, Optional, Type
-import pydantic
 from pydantic import BaseModel
 
 
-class MooreState(pydantic.BaseModel):
+@dataclasses.dataclass
+class MooreState:
     """
     Represents a state in the Finite State Machine (FSM) for managing the AI's conversation flow.
 
@@ -16,6 +17,10 @@ class MooreState(pydantic.BaseModel):
     :param pre_process_input: Optional callable for pre-processing the user input before running the state function.
     :param pre_process_chat: Optional callable for pre-processing the chat input before running the state function.
     :param pre_process_system_prompt: Optional callable for pre-processing the system prompt before it is sent.
+    :param func_is_async: Whether `func` is a coroutine function, detected at registration so each turn can skip the awaitable check.
+    :param compiled_template: Pre-compiled Jinja2 template of the system prompt, filled in at registration time.
+    :param static_system_prompt: Fully processed system prompt, precomputed when the prompt needs no per-turn work.
+    :param system_prompt_is_static: Whether the system prompt contains no Jinja2 substitutions, letting the render be skipped.
 
     :type key: str
     :type func: Callable
@@ -26,8 +31,14 @@ class MooreState(pydantic.BaseModel):
     :type pre_process_input: Callable, optional
     :type pre_process_chat: Callable, optional
     :type pre_process_system_prompt: Callable, optional
+    :type func_is_async: bool
+    :type compiled_template: jinja2.Template, optional
+    :type static_system_prompt: str, optional
+    :type system_prompt_is_static: bool
 
     .. note:: The `transitions` dictionary should map input keys to corresponding state keys for proper FSM flow.
+
+    .. note:: This is a plain dataclass rather than a pydantic model, instances are only built internally so per-construction validation would be wasted work.
     """
 
     key: str
@@ -39,6 +50,10 @@ class MooreState(pydantic.BaseModel):
     pre_process_input: Optional[Callable]
     pre_process_chat: Optional[Callable]
     pre_process_system_prompt: Optional[Callable]
+    func_is_async: bool = True
+    compiled_template: Any = None
+    static_system_prompt: Optional[str] = None
+    system_prompt_is_static: bool = False
 
 
 class DefaultResponse(BaseModel):
@@ -55,7 +70,8 @@ class DefaultResponse(BaseModel):
     content: str
 
 
-class MooreRun(pydantic.BaseModel):
+@dataclasses.dataclass
+class MooreRun:
     """
     Represents the outcome of a single run/step in the FSM.
 
@@ -72,6 +88,8 @@ class MooreRun(pydantic.BaseModel):
     :type response: Any
 
     .. note:: The `response` attribute may be of any type, depending on the response model used.
+
+    .. note:: `context_data` is a snapshot of the user defined context at the end of the run, later mutations of the FSM context do not bleed into previously returned runs.
     """
 
     state: str
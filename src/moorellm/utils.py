@@ -1,9 +1,46 @@
+import enum
+import functools
 import json
 from typing import Callable, Dict, Any, Literal, Optional, Type, Union
 from pydantic import BaseModel, ValidationError, create_model
 
 from moorellm.models import MooreState, DefaultResponse
 
+# orjson is an optional Rust-backed speedup for the JSON hot paths
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_sorted(data: Any) -> bytes:
+    """Serialize to JSON bytes with sorted keys, for stable cache hashing."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(data, sort_keys=True).encode()
+
+
+# Cache of dynamically created EnclosedResponse models, creating a pydantic
+# model is expensive (core schema compilation) and the output is invariant
+# for a given (state, transitions, response model) combination
+_MODEL_CACHE: dict = {}
+
+# Cache of next_state_key enums keyed by the transition-key tuple, so pydantic
+# interns one core schema per transition set instead of recompiling a fresh
+# Literal type
+_NEXT_STATE_ENUM_CACHE: dict = {}
+
+
+def _next_state_key_type(transition_keys: tuple) -> Type[enum.Enum]:
+    """Get (or build) the str-based enum of legal next state keys."""
+    cached_enum = _NEXT_STATE_ENUM_CACHE.get(transition_keys)
+    if cached_enum is None:
+        cached_enum = enum.Enum(
+            "NextStateKey", {key: key for key in transition_keys}, type=str
+        )
+        _NEXT_STATE_ENUM_CACHE[transition_keys] = cached_enum
+    return cached_enum
+
 
 def _create_response_model(
     current_state_model: Union[Type[BaseModel], None],
@@ -11,34 +48,86 @@ def _create_response_model(
     default_state: str,
 ) -> Type[BaseModel]:
     """Create a response model based on the current state model and transitions, this will be used for structured_response openai param."""
+    if not current_state_model:
+        current_state_model = DefaultResponse
 
-    # Extract the transition keys as a tuple for the Literal type
-    transition_keys = tuple([default_state] + list(transitions.keys()))
+    cache_key = (
+        default_state,
+        tuple(sorted(transitions.keys())),
+        current_state_model,
+    )
+    cached_model = _MODEL_CACHE.get(cache_key)
+    if cached_model is not None:
+        return cached_model
 
-    next_state_key_type = Literal.__getitem__(transition_keys)
+    # Extract the transition keys as a tuple for the enum type
+    transition_keys = tuple([default_state] + list(transitions.keys()))
 
-    if not current_state_model:
-        current_state_model = DefaultResponse
+    next_state_key_type = _next_state_key_type(transition_keys)
 
     # Dynamically create the model with response and next_state_key fields
-    return create_model(
+    enclosed_model = create_model(
         "EnclosedResponse",
         response=(current_state_model, ...),
         next_state_key=(next_state_key_type, ...),
     )
+    _MODEL_CACHE[cache_key] = enclosed_model
+    return enclosed_model
+
+
+def _dump_enclosed_response(parsed: BaseModel) -> dict:
+    """Dump an EnclosedResponse with next_state_key as a plain string.
+
+    model_dump() yields the NextStateKey enum member, but the dict flows into
+    the response caches and out as MooreRun.response_raw where consumers
+    expect the plain string the original Literal-typed field produced.
+    """
+    dumped = parsed.model_dump()
+    next_state_key = dumped.get("next_state_key")
+    dumped["next_state_key"] = getattr(next_state_key, "value", next_state_key)
+    return dumped
 
 
 def _add_transitions(system_prompt: str, moore_state: MooreState) -> str:
     """Add transitions to the system prompt."""
-    system_prompt += f"\n\nYou are currently in {moore_state.key} and based on user input, you can transition to the following states (with conditions defined):"
-    for key, value in moore_state.transitions.items():
-        system_prompt += f"\n- {key}: {value}"
+    parts = [
+        system_prompt,
+        f"\n\nYou are currently in {moore_state.key} and based on user input, you can transition to the following states (with conditions defined):",
+    ]
+    # Stable ordering keeps the prompt byte-identical across turns, which is
+    # what OpenAI's implicit prompt caching matches on
+    for key, value in sorted(moore_state.transitions.items()):
+        parts.append(f"\n- {key}: {value}")
+
+    parts.append(
+        "\n\nIn response add the state you want to transition to.. (or leave blank to stay in the current state)"
+    )
+    return "".join(parts)
+
+
+# Fixed skeleton of the wrapped payload, assembly is then three bytes
+# concatenations instead of building and serializing a wrapper dict
+_WRAP_PREFIX = b'{"response": '
+_WRAP_MID = b', "next_state_key": '
+_WRAP_SUFFIX = b"}"
 
-    system_prompt += "\n\nIn response add the state you want to transition to.. (or leave blank to stay in the current state)"
-    return system_prompt
 
+@functools.lru_cache(maxsize=256)
+def _wrap_cached(dumped_response: str, next_state: str) -> str:
+    if orjson is not None:
+        next_state_json = orjson.dumps(next_state)
+    else:
+        next_state_json = json.dumps(next_state).encode()
+    return (
+        _WRAP_PREFIX
+        + dumped_response.encode()
+        + _WRAP_MID
+        + next_state_json
+        + _WRAP_SUFFIX
+    ).decode()
 
-def wrap_into_json_response(data: BaseModel, next_state: str) -> BaseModel:
-    dict_res = {"response": data.model_dump(), "next_state_key": next_state}
 
-    return json.dumps(dict_res)
+def wrap_into_json_response(data: BaseModel, next_state: str) -> str:
+    # Key on the serialized model since pydantic instances are not hashable,
+    # repeated identical payloads then skip the assembly entirely
+    return _wrap_cached(data.model_dump_json(), next_state)
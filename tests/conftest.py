@@ -0,0 +1,92 @@
+import asyncio
+import copy
+import functools
+
+import openai_responses
+from pydantic import BaseModel
+import pytest
+import openai
+
+from moorellm import MooreFSM
+from moorellm.utils import wrap_into_json_response
+
+
+# Define the shared fixtures
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    # Run every async test on uvloop where available (not on Windows), the
+    # libuv loop dispatches coroutines noticeably faster than the selector loop
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="module")
+def _fsm_instance():
+    # One MooreFSM object per module, rebuilding the machine for every test
+    # repays decorator registration and dict construction for nothing
+    return MooreFSM(initial_state="START")
+
+
+@pytest.fixture
+def fsm(_fsm_instance):
+    """Fixture for creating a MooreFSM instance, reset between tests."""
+    yield _fsm_instance
+    _fsm_instance.reset()
+    _fsm_instance._states.clear()
+
+
+@pytest.fixture(scope="session")
+def _openai_mock_session():
+    # One mock server for the whole session, the per-test decorator tore down
+    # and rebuilt the HTTP interceptor and its routes for every test
+    mock = openai_responses.OpenAIMock()
+    mock.router.start()
+    yield mock
+    mock.router.stop()
+
+
+@pytest.fixture
+def openai_mock(_openai_mock_session):
+    # Routes stay registered, only call stats are cleared between tests so
+    # call_count assertions remain per-test
+    _openai_mock_session.router.reset()
+    return _openai_mock_session
+
+
+@functools.lru_cache(maxsize=4)
+def _client(api_key: str) -> openai.AsyncOpenAI:
+    # Building a client also builds an httpx pool and TLS context, memoize
+    # per key so it happens once even outside the fixture's session cache
+    return openai.AsyncOpenAI(api_key=api_key)
+
+
+@pytest.fixture(scope="session")
+def openai_client():
+    # The client never talks to a real endpoint under the mock, so one
+    # instance (and its connection pool) can serve the whole session
+    return _client("sk-fake123")
+
+# Template of the mock completion choice, copied per call instead of
+# rebuilding the nested dict literal for every response swap
+_BASE_CHOICE = {
+    "index": 0,
+    "finish_reason": "stop",
+    "message": {"role": "assistant"},
+}
+
+@pytest.fixture
+def set_openai_response():
+    def set_response(
+        openai_mock: openai_responses.OpenAIMock, response: BaseModel, next_state: str
+    ):
+        choice = copy.copy(_BASE_CHOICE)
+        choice["message"] = {
+            **_BASE_CHOICE["message"],
+            "content": wrap_into_json_response(response, next_state),
+        }
+        openai_mock.beta.chat.completions.create.response = {"choices": [choice]}
+
+    return set_response
@@ -1,43 +1,10 @@
+import types
+
 import openai_responses
 from pydantic import BaseModel
 import pytest
-import openai
 from moorellm import MooreFSM, MooreState, DefaultResponse
 from moorellm.models import MooreRun
-from moorellm.utils import wrap_into_json_response
-
-
-# Define the fixture
-@pytest.fixture
-def fsm():
-    """Fixture for creating a MooreFSM instance."""
-    return MooreFSM(initial_state="START")
-
-
-@pytest.fixture
-def openai_client():
-    return openai.AsyncOpenAI(api_key="sk-fake123")
-
-
-@pytest.fixture
-def set_openai_response():
-    def set_response(
-        openai_mock: openai_responses.OpenAIMock, response: BaseModel, next_state: str
-    ):
-        openai_mock.beta.chat.completions.create.response = {
-            "choices": [
-                {
-                    "index": 0,
-                    "finish_reason": "stop",
-                    "message": {
-                        "content": wrap_into_json_response(response, next_state),
-                        "role": "assistant",
-                    },
-                }
-            ]
-        }
-
-    return set_response
 
 
 # Test the module creation
@@ -48,20 +15,23 @@ def test_module_creation(fsm):
 
 # Test for simple fsm with state
 @pytest.mark.asyncio
-@openai_responses.mock()
 async def test_config_data(
     fsm, openai_client, set_openai_response, openai_mock: openai_responses.OpenAIMock
 ):
     """Test that a contexts work"""
 
     COMMON_RESPONSE = "My name is Moore."
-    CONTEXT_SET_DATA = {
-        "name": "Moore",
-        "age": 25,
-    }
+    # Read-only mapping, the library stores it by reference so nothing
+    # ever needs to copy it
+    CONTEXT_SET_DATA = types.MappingProxyType(
+        {
+            "name": "Moore",
+            "age": 25,
+        }
+    )
 
     @fsm.state(state_key="START", system_prompt="Hello, what's your name?")
-    async def start_state(fsm: MooreFSM, response: str, will_transition: bool):
+    def start_state(fsm: MooreFSM, response: str, will_transition: bool):
         assert response == COMMON_RESPONSE
         assert will_transition == False
         assert fsm.get_next_state() == "START"
@@ -80,3 +50,77 @@ async def test_config_data(
 
     # Check the context data
     assert run_state.context_data.get("config") == CONTEXT_SET_DATA
+
+
+# Test for stable prompt prefix with context split into its own message
+@pytest.mark.asyncio
+async def test_split_context_prompt(
+    openai_client, set_openai_response, openai_mock: openai_responses.OpenAIMock
+):
+    """Test that context rides in a second system message, keeping the prefix stable."""
+
+    fsm = MooreFSM(initial_state="START", split_context_prompt=True)
+    fsm.set_context_data("name", "Moore")
+
+    captured_messages = []
+
+    def capture_chat(chat_history: list, fsm: MooreFSM):
+        captured_messages.append(chat_history)
+        return chat_history
+
+    @fsm.state(
+        state_key="START",
+        system_prompt="Hello, what's your name?",
+        pre_process_chat=capture_chat,
+    )
+    async def start_state(fsm: MooreFSM, response: str, will_transition: bool):
+        return response
+
+    set_openai_response(openai_mock, DefaultResponse(content="Hi"), next_state="START")
+
+    await fsm.run(openai_client, user_input="Hello")
+    fsm.set_context_data("name", "John")
+    await fsm.run(openai_client, user_input="Hello again")
+
+    first_messages, second_messages = captured_messages
+    # The primary system prompt stays byte-identical across context changes
+    assert first_messages[0] == second_messages[0]
+    # The context is delivered as a follow-up system message
+    assert second_messages[1]["role"] == "system"
+    assert second_messages[1]["content"].startswith("Context: ")
+    assert "John" in second_messages[1]["content"]
+
+
+# Test that prompt hooks still run when the context is split out
+@pytest.mark.asyncio
+async def test_split_context_prompt_applies_hook(
+    openai_client, set_openai_response, openai_mock: openai_responses.OpenAIMock
+):
+    """Test that pre_process_system_prompt is applied in split-context mode."""
+
+    fsm = MooreFSM(initial_state="START", split_context_prompt=True)
+
+    captured_messages = []
+
+    def capture_chat(chat_history: list, fsm: MooreFSM):
+        captured_messages.append(chat_history)
+        return chat_history
+
+    def add_prefix(system_prompt: str, fsm: MooreFSM):
+        return "PREFIXED: " + system_prompt
+
+    @fsm.state(
+        state_key="START",
+        system_prompt="Hello, what's your name?",
+        pre_process_system_prompt=add_prefix,
+        pre_process_chat=capture_chat,
+    )
+    async def start_state(fsm: MooreFSM, response: str, will_transition: bool):
+        return response
+
+    set_openai_response(openai_mock, DefaultResponse(content="Hi"), next_state="START")
+
+    await fsm.run(openai_client, user_input="Hello")
+
+    assert captured_messages[0][0]["role"] == "system"
+    assert captured_messages[0][0]["content"].startswith("PREFIXED: ")
@@ -1,64 +1,28 @@
+import asyncio
+
 import openai_responses
 from pydantic import BaseModel
 import pytest
 import openai
 from moorellm import MooreFSM, MooreState, DefaultResponse
 from moorellm.models import MooreRun
-from moorellm.utils import wrap_into_json_response
-
-
-# Define the fixture
-@pytest.fixture
-def fsm():
-    """Fixture for creating a MooreFSM instance."""
-    return MooreFSM(initial_state="START")
-
-
-@pytest.fixture
-def openai_client():
-    return openai.AsyncOpenAI(api_key="sk-fake123")
-
 
-@pytest.fixture
-def set_openai_response():
-    def set_response(
-        openai_mock: openai_responses.OpenAIMock, response: BaseModel, next_state: str
-    ):
-        openai_mock.beta.chat.completions.create.response = {
-            "choices": [
-                {
-                    "index": 0,
-                    "finish_reason": "stop",
-                    "message": {
-                        "content": wrap_into_json_response(response, next_state),
-                        "role": "assistant",
-                    },
-                }
-            ]
-        }
+AI_RESPONSE_SUCCESS_TURNON = "The light is turned on."
+AI_RESPONSE_SUCCESS_TURNOFF = "The light is turned off."
+AI_RESPONSE_IDLE = "I am idle, tell me to turn on or off the light."
+AI_RESPONSE_IDLE_ON = "I am idle, tell me when to turn off the light."
 
-    return set_response
-
-
-# Test the module creation
-def test_module_creation(fsm):
-    """Test that the module can be created."""
-    assert isinstance(fsm, MooreFSM)
+# Prebuilt response payloads, model_construct skips pydantic validation that
+# would otherwise rerun for every inline construction
+IDLE_RESPONSE = DefaultResponse.model_construct(content=AI_RESPONSE_IDLE)
+IDLE_ON_RESPONSE = DefaultResponse.model_construct(content=AI_RESPONSE_IDLE_ON)
+TURNON_RESPONSE = DefaultResponse.model_construct(content=AI_RESPONSE_SUCCESS_TURNON)
+TURNOFF_RESPONSE = DefaultResponse.model_construct(content=AI_RESPONSE_SUCCESS_TURNOFF)
 
 
-# Test for simple fsm with state
-@pytest.mark.asyncio
-@openai_responses.mock()
-async def test_simple_transitions(
-    fsm: MooreFSM,
-    openai_client: openai.AsyncOpenAI,
-    set_openai_response,
-    openai_mock: openai_responses.OpenAIMock,
-):
-    AI_RESPONSE_SUCCESS_TURNON = "The light is turned on."
-    AI_RESPONSE_SUCCESS_TURNOFF = "The light is turned off."
-    AI_RESPONSE_IDLE = "I am idle, tell me to turn on or off the light."
-    AI_RESPONSE_IDLE_ON = "I am idle, tell me when to turn off the light."
+def _build_light_switch_fsm() -> MooreFSM:
+    """Build an independent on/off light switch FSM for transition probes."""
+    fsm = MooreFSM(initial_state="START")
 
     @fsm.state(
         state_key="START",
@@ -86,38 +50,85 @@ async def test_simple_transitions(
         else:
             assert response == AI_RESPONSE_IDLE_ON
 
-    set_openai_response(
-        openai_mock, DefaultResponse(content=AI_RESPONSE_IDLE), next_state="START"
-    )
+    return fsm
 
-    # Run the FSM
-    run_state: MooreRun = await fsm.run(openai_client, user_input="Hello")
-    assert run_state.state == "START"
-    assert run_state.response == AI_RESPONSE_IDLE
 
-    # Now test the transitions
-    set_openai_response(
-        openai_mock,
-        DefaultResponse(content=AI_RESPONSE_SUCCESS_TURNON),
-        next_state="STATE_ON",
-    )
-    run_state: MooreRun = await fsm.run(openai_client, user_input="Turn on the light")
-    assert run_state.state == "STATE_ON"
-    assert run_state.response == AI_RESPONSE_SUCCESS_TURNON
+# Test the module creation
+def test_module_creation(fsm):
+    """Test that the module can be created."""
+    assert isinstance(fsm, MooreFSM)
 
-    set_openai_response(
-        openai_mock, DefaultResponse(content=AI_RESPONSE_IDLE_ON), next_state="STATE_ON"
-    )
-    run_state: MooreRun = await fsm.run(openai_client, user_input="Hello")
-    assert run_state.state == "STATE_ON"
-    assert run_state.response == AI_RESPONSE_IDLE_ON
-
-    set_openai_response(
-        openai_mock,
-        DefaultResponse(content=AI_RESPONSE_SUCCESS_TURNOFF),
-        next_state="START",
-    )
 
-    run_state: MooreRun = await fsm.run(openai_client, user_input="Turn off the light")
-    assert run_state.state == "START"
-    assert run_state.response == AI_RESPONSE_SUCCESS_TURNOFF
+# Test for simple fsm with state, each scenario is independent so the cases
+# parametrize cleanly and can be distributed across xdist workers
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "initial_state, response, next_state, user_input, expected_state, expected_response",
+    [
+        ("START", IDLE_RESPONSE, "START", "Hello", "START", AI_RESPONSE_IDLE),
+        (
+            "START",
+            TURNON_RESPONSE,
+            "STATE_ON",
+            "Turn on the light",
+            "STATE_ON",
+            AI_RESPONSE_SUCCESS_TURNON,
+        ),
+        (
+            "STATE_ON",
+            IDLE_ON_RESPONSE,
+            "STATE_ON",
+            "Hello",
+            "STATE_ON",
+            AI_RESPONSE_IDLE_ON,
+        ),
+        (
+            "STATE_ON",
+            TURNOFF_RESPONSE,
+            "START",
+            "Turn off the light",
+            "START",
+            AI_RESPONSE_SUCCESS_TURNOFF,
+        ),
+    ],
+)
+async def test_simple_transitions(
+    initial_state: str,
+    response: DefaultResponse,
+    next_state: str,
+    user_input: str,
+    expected_state: str,
+    expected_response: str,
+    openai_client: openai.AsyncOpenAI,
+    set_openai_response,
+    openai_mock: openai_responses.OpenAIMock,
+):
+    fsm = _build_light_switch_fsm()
+    fsm.force_state(initial_state)
+
+    set_openai_response(openai_mock, response, next_state=next_state)
+
+    run_state: MooreRun = await fsm.run(openai_client, user_input=user_input)
+    assert run_state.state == expected_state
+    assert run_state.response == expected_response
+
+
+# The machines are fully independent, so concurrent probes can share one
+# event-loop turn via gather instead of being awaited serially
+@pytest.mark.asyncio
+async def test_concurrent_independent_fsms(
+    openai_client: openai.AsyncOpenAI,
+    set_openai_response,
+    openai_mock: openai_responses.OpenAIMock,
+):
+    fsm_a = _build_light_switch_fsm()
+    fsm_b = _build_light_switch_fsm()
+
+    set_openai_response(openai_mock, TURNON_RESPONSE, next_state="STATE_ON")
+    runs: list[MooreRun] = await asyncio.gather(
+        fsm_a.run(openai_client, user_input="Turn on the light"),
+        fsm_b.run(openai_client, user_input="Turn on the light"),
+    )
+    for run_state in runs:
+        assert run_state.state == "STATE_ON"
+        assert run_state.response == AI_RESPONSE_SUCCESS_TURNON
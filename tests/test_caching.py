@@ -0,0 +1,191 @@
+import openai_responses
+from pydantic import BaseModel
+import pytest
+import openai
+from moorellm import MooreFSM, MooreState, DefaultResponse
+from moorellm.models import MooreRun
+
+
+# Define the fixture
+@pytest.fixture
+def fsm():
+    """Fixture for creating a MooreFSM instance with caching enabled."""
+    return MooreFSM(initial_state="START", enable_cache=True)
+
+
+# Test for exact-match response caching
+@pytest.mark.asyncio
+async def test_exact_match_cache(
+    fsm: MooreFSM,
+    openai_client: openai.AsyncOpenAI,
+    set_openai_response,
+    openai_mock: openai_responses.OpenAIMock,
+):
+    """Test that an identical turn is served from the cache without an API call."""
+
+    COMMON_RESPONSE = "My name is Moore."
+
+    @fsm.state(state_key="START", system_prompt="Hello, what's your name?")
+    async def start_state(fsm: MooreFSM, response: str, will_transition: bool):
+        return response
+
+    set_openai_response(
+        openai_mock, DefaultResponse(content=COMMON_RESPONSE), next_state="START"
+    )
+
+    # Run the FSM
+    run_state: MooreRun = await fsm.run(openai_client, user_input="Hello")
+    assert run_state.response == COMMON_RESPONSE
+    assert openai_mock.beta.chat.completions.create.route.call_count == 1
+
+    # Re-run the byte-identical turn, should be served from cache
+    fsm.set_chat_history([])
+    run_state: MooreRun = await fsm.run(openai_client, user_input="Hello")
+    assert run_state.response == COMMON_RESPONSE
+    assert openai_mock.beta.chat.completions.create.route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache(
+    openai_client: openai.AsyncOpenAI,
+    set_openai_response,
+    openai_mock: openai_responses.OpenAIMock,
+):
+    """Test that near-duplicate inputs are served from the semantic cache."""
+
+    COMMON_RESPONSE = "The light is turned on."
+
+    fsm = MooreFSM(initial_state="START", semantic_cache=True)
+
+    @fsm.state(state_key="START", system_prompt="You are a light switching AI")
+    async def start_state(fsm: MooreFSM, response: str, will_transition: bool):
+        return response
+
+    set_openai_response(
+        openai_mock, DefaultResponse(content=COMMON_RESPONSE), next_state="START"
+    )
+    # Both inputs embed to the same vector under the mock, ie a paraphrase
+    openai_mock.embeddings.create.response = {
+        "data": [{"index": 0, "object": "embedding", "embedding": [0.6, 0.8]}]
+    }
+
+    run_state: MooreRun = await fsm.run(openai_client, user_input="Turn on the light")
+    assert run_state.response == COMMON_RESPONSE
+    assert openai_mock.beta.chat.completions.create.route.call_count == 1
+
+    fsm.set_chat_history([])
+    run_state: MooreRun = await fsm.run(openai_client, user_input="Switch the light on")
+    assert run_state.response == COMMON_RESPONSE
+    assert openai_mock.beta.chat.completions.create.route.call_count == 1
+    assert openai_mock.embeddings.create.route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_speculative_prefetch(
+    openai_client: openai.AsyncOpenAI,
+    set_openai_response,
+    openai_mock: openai_responses.OpenAIMock,
+):
+    """Test that a repeated input is answered from the speculatively warmed cache."""
+
+    import asyncio
+
+    COMMON_RESPONSE = "My name is Moore."
+
+    fsm = MooreFSM(initial_state="START", enable_cache=True, speculative=True)
+
+    @fsm.state(state_key="START", system_prompt="Hello, what's your name?")
+    async def start_state(fsm: MooreFSM, response: str, will_transition: bool):
+        return response
+
+    set_openai_response(
+        openai_mock, DefaultResponse(content=COMMON_RESPONSE), next_state="START"
+    )
+
+    await fsm.run(openai_client, user_input="Hello")
+    # Let the background prefetch finish, it issues the second API call
+    await asyncio.gather(*fsm._speculative_tasks)
+    assert openai_mock.beta.chat.completions.create.route.call_count == 2
+
+    # Repeating the guessed input is now served from the cache
+    run_state: MooreRun = await fsm.run(openai_client, user_input="Hello")
+    assert run_state.response == COMMON_RESPONSE
+    assert openai_mock.beta.chat.completions.create.route.call_count == 2
+
+
+def test_sqlite_response_cache(tmp_path):
+    """Test basic get/put round-trips of the SQLite response cache."""
+
+    from moorellm.cache import SqliteResponseCache
+
+    cache = SqliteResponseCache(str(tmp_path / "responses.db"))
+    assert cache.get("missing") is None
+
+    response_dict = {"response": {"content": "Hi"}, "next_state_key": "START"}
+    cache.put("some-key", response_dict)
+    assert cache.get("some-key") == response_dict
+    cache.close()
+
+    # A fresh connection to the same file still sees the entry
+    reopened = SqliteResponseCache(str(tmp_path / "responses.db"))
+    assert reopened.get("some-key") == response_dict
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_disk_cache(
+    openai_client: openai.AsyncOpenAI,
+    set_openai_response,
+    openai_mock: openai_responses.OpenAIMock,
+    tmp_path,
+):
+    """Test that a second FSM instance reuses responses cached on disk."""
+
+    COMMON_RESPONSE = "My name is Moore."
+    cache_path = str(tmp_path / "responses.db")
+
+    def make_fsm() -> MooreFSM:
+        fsm = MooreFSM(initial_state="START", cache_path=cache_path)
+
+        @fsm.state(state_key="START", system_prompt="Hello, what's your name?")
+        async def start_state(fsm: MooreFSM, response: str, will_transition: bool):
+            return response
+
+        return fsm
+
+    set_openai_response(
+        openai_mock, DefaultResponse(content=COMMON_RESPONSE), next_state="START"
+    )
+
+    run_state: MooreRun = await make_fsm().run(openai_client, user_input="Hello")
+    assert run_state.response == COMMON_RESPONSE
+    assert openai_mock.beta.chat.completions.create.route.call_count == 1
+
+    # A fresh FSM (fresh process in real life) hits the disk cache instead
+    run_state: MooreRun = await make_fsm().run(openai_client, user_input="Hello")
+    assert run_state.response == COMMON_RESPONSE
+    assert openai_mock.beta.chat.completions.create.route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_disabled_by_default(
+    openai_client: openai.AsyncOpenAI,
+    set_openai_response,
+    openai_mock: openai_responses.OpenAIMock,
+):
+    """Test that caching is opt-in and identical turns still hit the API."""
+
+    fsm = MooreFSM(initial_state="START")
+
+    @fsm.state(state_key="START", system_prompt="Hello, what's your name?")
+    async def start_state(fsm: MooreFSM, response: str, will_transition: bool):
+        return response
+
+    set_openai_response(
+        openai_mock, DefaultResponse(content="Hi"), next_state="START"
+    )
+
+    await fsm.run(openai_client, user_input="Hello")
+    fsm.set_chat_history([])
+    await fsm.run(openai_client, user_input="Hello")
+    assert openai_mock.beta.chat.completions.create.route.call_count == 2
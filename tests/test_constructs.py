@@ -1,13 +1,6 @@
-import pytest
 from moorellm import MooreFSM
 
 
-@pytest.fixture
-def fsm():
-    """Fixture for creating a MooreFSM instance."""
-    return MooreFSM(initial_state="START")
-
-
 def test_module_creation(fsm):
     """Test that the module can be created."""
     assert isinstance(fsm, MooreFSM)
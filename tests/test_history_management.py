@@ -0,0 +1,86 @@
+import openai_responses
+from pydantic import BaseModel
+import pytest
+import openai
+from moorellm import MooreFSM, DefaultResponse
+from moorellm.models import MooreRun
+
+
+# Test for the sliding history window
+@pytest.mark.asyncio
+async def test_history_sliding_window(
+    openai_client: openai.AsyncOpenAI,
+    set_openai_response,
+    openai_mock: openai_responses.OpenAIMock,
+):
+    """Test that only the most recent messages are sent while the stored history keeps growing."""
+
+    fsm = MooreFSM(initial_state="START", max_history_messages=2, summarize_after=None)
+
+    sent_messages = []
+
+    def capture_chat(chat_history: list, fsm: MooreFSM):
+        sent_messages.append(chat_history)
+        return chat_history
+
+    @fsm.state(
+        state_key="START",
+        system_prompt="Hello, how can I help you?",
+        pre_process_chat=capture_chat,
+    )
+    async def start_state(fsm: MooreFSM, response: str, will_transition: bool):
+        return response
+
+    set_openai_response(openai_mock, DefaultResponse(content="Hi"), next_state="START")
+
+    for index in range(3):
+        await fsm.run(openai_client, user_input=f"Hello {index}")
+
+    # System prompt plus at most two history messages per request
+    assert all(len(messages) <= 3 for messages in sent_messages)
+    # The window always ends with the newest user input
+    assert sent_messages[-1][-1]["content"] == "Hello 2"
+    # The stored history is untouched by the window
+    assert len(fsm.get_chat_history()) == 6
+
+
+# Test for history summarization
+@pytest.mark.asyncio
+async def test_history_summarization(
+    openai_client: openai.AsyncOpenAI,
+    openai_mock: openai_responses.OpenAIMock,
+):
+    """Test that the oldest half of the history is compacted into a summary message."""
+
+    openai_mock.chat.completions.create.response = {
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"content": "a short summary", "role": "assistant"},
+            }
+        ]
+    }
+
+    fsm = MooreFSM(initial_state="START")
+    fsm.set_chat_history(
+        [
+            {"role": "user", "content": f"message {index}"}
+            for index in range(6)
+        ]
+    )
+    full_history_before = fsm.get_full_chat_history().copy()
+
+    await fsm._summarize_history(openai_client)
+
+    chat_history = fsm.get_chat_history()
+    assert chat_history[0] == {
+        "role": "system",
+        "content": "Conversation so far: a short summary",
+    }
+    # The newest half of the history is preserved verbatim
+    assert chat_history[1:] == [
+        {"role": "user", "content": f"message {index}"} for index in range(3, 6)
+    ]
+    # The full history stays untouched for audit
+    assert fsm.get_full_chat_history() == full_history_before
@@ -4,40 +4,9 @@ import pytest
 import openai
 from moorellm import MooreFSM, MooreState, DefaultResponse
 from moorellm.models import MooreRun, ImmediateStateChange
-from moorellm.utils import wrap_into_json_response
 
-
-# Define the fixture
-@pytest.fixture
-def fsm():
-    """Fixture for creating a MooreFSM instance."""
-    return MooreFSM(initial_state="START")
-
-
-@pytest.fixture
-def openai_client():
-    return openai.AsyncOpenAI(api_key="sk-fake123")
-
-
-@pytest.fixture
-def set_openai_response():
-    def set_response(
-        openai_mock: openai_responses.OpenAIMock, response: BaseModel, next_state: str
-    ):
-        openai_mock.beta.chat.completions.create.response = {
-            "choices": [
-                {
-                    "index": 0,
-                    "finish_reason": "stop",
-                    "message": {
-                        "content": wrap_into_json_response(response, next_state),
-                        "role": "assistant",
-                    },
-                }
-            ]
-        }
-
-    return set_response
+# Prebuilt empty payload, model_construct skips re-validating the same literal
+EMPTY_RESPONSE = DefaultResponse.model_construct(content="")
 
 
 # Test the module creation
@@ -48,7 +17,6 @@ def test_module_creation(fsm):
 
 # Test for simple fsm with state
 @pytest.mark.asyncio
-@openai_responses.mock()
 async def test_immediete_state_transition(
     fsm: MooreFSM,
     openai_client: openai.AsyncOpenAI,
@@ -75,7 +43,7 @@ async def test_immediete_state_transition(
         system_prompt="Change state but not immediately",
         transitions={"START": "Change to start state"},
     )
-    async def change_not_immediate_state(
+    def change_not_immediate_state(
         fsm: MooreFSM, response: str, will_transition: bool
     ):
         return "I REPLIED FROM CHANGE_NOT_IMMEDIATE_STATE"
@@ -85,13 +53,13 @@ async def test_immediete_state_transition(
         system_prompt="Change state immediately",
         transitions={"START": "Change to start state"},
     )
-    async def change_immediate_state(
+    def change_immediate_state(
         fsm: MooreFSM, response: str, will_transition: bool
     ):
         return "I REPLIED FROM CHANGE_IMMEDIATE_STATE"
 
     set_openai_response(
-        openai_mock, DefaultResponse(content=""), next_state="CHANGE_NOT_IMMEDIATE"
+        openai_mock, EMPTY_RESPONSE, next_state="CHANGE_NOT_IMMEDIATE"
     )
 
     # Run the FSM
@@ -100,11 +68,11 @@ async def test_immediete_state_transition(
     # First the response should be from the start state (as we made simple transition)
     assert run_state.response == "I REPLIED FROM START_STATE"
 
-    # For sake of test, set the next state to be main again
-    fsm._state = "START"
+    # For sake of test, set the state to be main again
+    fsm.force_state("START")
 
     set_openai_response(
-        openai_mock, DefaultResponse(content=""), next_state="CHANGE_IMMEDIATE"
+        openai_mock, EMPTY_RESPONSE, next_state="CHANGE_IMMEDIATE"
     )
 
     # Now test the transitions in case immediate state change
@@ -4,45 +4,10 @@ import pytest
 import openai
 from moorellm import MooreFSM, MooreState, DefaultResponse
 from moorellm.models import MooreRun
-from moorellm.utils import wrap_into_json_response
-
-
-# Define the fixture
-@pytest.fixture
-def fsm():
-    """Fixture for creating a MooreFSM instance."""
-    return MooreFSM(initial_state="START")
-
-
-@pytest.fixture
-def openai_client():
-    return openai.AsyncOpenAI(api_key="sk-fake123")
-
-
-@pytest.fixture
-def set_openai_response():
-    def set_response(
-        openai_mock: openai_responses.OpenAIMock, response: BaseModel, next_state: str
-    ):
-        openai_mock.beta.chat.completions.create.response = {
-            "choices": [
-                {
-                    "index": 0,
-                    "finish_reason": "stop",
-                    "message": {
-                        "content": wrap_into_json_response(response, next_state),
-                        "role": "assistant",
-                    },
-                }
-            ]
-        }
-
-    return set_response
 
 
 # Test for simple fsm with state
 @pytest.mark.asyncio
-@openai_responses.mock()
 async def test_jinja2(
     fsm: MooreFSM,
     openai_client: openai.AsyncOpenAI,
@@ -63,7 +28,7 @@ async def test_jinja2(
         system_prompt=JINJA2_TEMPLATE,
         pre_process_system_prompt=assert_system_prompt,
     )
-    async def start_state(fsm: MooreFSM, response: str, will_transition: bool):
+    def start_state(fsm: MooreFSM, response: str, will_transition: bool):
         pass
 
     set_openai_response(openai_mock, DefaultResponse(content=""), next_state="START")
@@ -4,7 +4,6 @@ from datetime import datetime
 import openai
 from pydantic import BaseModel
 
-import openai_responses
 from openai_responses import OpenAIMock
 import pytest
 
@@ -15,7 +14,6 @@ class CalendarEvent(BaseModel):
     participants: list[str]
 
 
-@openai_responses.mock()
 @pytest.mark.asyncio()
 async def test_create_parsed_chat_completion_with_response_format(
     openai_mock: OpenAIMock,
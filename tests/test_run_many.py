@@ -0,0 +1,86 @@
+import openai_responses
+from pydantic import BaseModel
+import pytest
+import openai
+from moorellm import MooreFSM, DefaultResponse, run_many
+
+
+def _make_fsm() -> MooreFSM:
+    fsm = MooreFSM(initial_state="START")
+
+    @fsm.state(state_key="START", system_prompt="Hello, how can I help you?")
+    async def start_state(fsm: MooreFSM, response: str, will_transition: bool):
+        return response
+
+    return fsm
+
+
+# Test for running multiple conversations concurrently
+@pytest.mark.asyncio
+async def test_run_many(
+    openai_client: openai.AsyncOpenAI,
+    set_openai_response,
+    openai_mock: openai_responses.OpenAIMock,
+):
+    """Test that run_many fans out independent conversations and keeps order."""
+
+    COMMON_RESPONSE = "Hello there!"
+
+    fsm_one = _make_fsm()
+    fsm_two = _make_fsm()
+
+    set_openai_response(
+        openai_mock, DefaultResponse(content=COMMON_RESPONSE), next_state="START"
+    )
+
+    results = await run_many(
+        openai_client,
+        [(fsm_one, "Hello"), (fsm_two, "Hi")],
+        max_concurrency=2,
+    )
+
+    assert len(results) == 2
+    assert all(run.response == COMMON_RESPONSE for run in results)
+    assert all(run.state == "START" for run in results)
+    assert openai_mock.beta.chat.completions.create.route.call_count == 2
+
+    # Each FSM kept its own conversation history
+    assert fsm_one.get_chat_history()[0]["content"] == "Hello"
+    assert fsm_two.get_chat_history()[0]["content"] == "Hi"
+
+
+# Test for packing multiple inputs into one request
+@pytest.mark.asyncio
+async def test_run_parallel_state(
+    openai_client: openai.AsyncOpenAI,
+    openai_mock: openai_responses.OpenAIMock,
+):
+    """Test that run_parallel_state returns one parsed response per input."""
+
+    import json
+
+    fsm = _make_fsm()
+
+    enclosed = [
+        {"response": {"content": "Hi one"}, "next_state_key": "START"},
+        {"response": {"content": "Hi two"}, "next_state_key": "START"},
+    ]
+    openai_mock.beta.chat.completions.create.response = {
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {
+                    "content": json.dumps({"responses": enclosed}),
+                    "role": "assistant",
+                },
+            }
+        ]
+    }
+
+    results = await fsm.run_parallel_state(openai_client, ["Hello", "Hi"])
+    assert results == enclosed
+    assert openai_mock.beta.chat.completions.create.route.call_count == 1
+    # The probe must not advance the FSM or touch its history
+    assert fsm.get_current_state() == "START"
+    assert fsm.get_chat_history() == []